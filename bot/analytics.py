@@ -0,0 +1,142 @@
+"""
+Analytics module:
+Buffers request analytics records in memory and appends them to a local
+JSON Lines file in batches from a background task, so the request path
+never touches the file directly. Batches are appended with a single
+os.write() on a long-lived O_APPEND file descriptor, run in a worker
+thread so a slow disk cannot stall the event loop.
+"""
+
+#imports
+import asyncio
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+from bot.settings import logger
+
+try:
+    import orjson
+
+    def _dumps(record: Dict) -> bytes:
+        """Serialize a record to JSON bytes (datetimes as ISO-8601)."""
+        return orjson.dumps(record)
+except ImportError:  # stdlib fallback
+    import json
+
+    def _dumps(record: Dict) -> bytes:
+        """Serialize a record to JSON bytes (datetimes as ISO-8601)."""
+        return json.dumps(record, default=lambda o: o.isoformat()).encode()
+
+# Configuration
+BATCH_SIZE = 100            # max records per write
+FLUSH_INTERVAL = 0.5        # seconds to wait for a batch to fill up
+
+# Queue sentinel telling the drain task to flush and exit
+_STOP = object()
+
+
+class AnalyticsWriter:
+    """
+    Batched JSONL writer backed by an asyncio.Queue and a background drain task.
+    Until start() is called (e.g. outside the app lifespan) records are
+    written through synchronously so nothing is dropped.
+    """
+
+    def __init__(self, path: Path, batch_size: int = BATCH_SIZE, flush_interval: float = FLUSH_INTERVAL):
+        self.path = Path(path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._fd: Optional[int] = None
+
+    def log(self, record: Dict) -> None:
+        """
+        Enqueue a record for the next batch (or write it directly if not started).
+        Args:
+            record (dict): JSON-serializable analytics record
+        """
+        if self._queue is None:
+            self._write([record])
+            return
+        self._queue.put_nowait(record)
+
+    async def start(self) -> None:
+        """
+        Open the log file and start the background drain task on the running event loop.
+        """
+        self._open()
+        self._queue = asyncio.Queue()
+        self._task = asyncio.create_task(self._drain())
+
+    async def stop(self) -> None:
+        """
+        Flush all queued records, stop the drain task and close the file descriptor.
+        A drain task that has already died is logged rather than re-raised.
+        """
+        try:
+            if self._task is not None:
+                self._queue.put_nowait(_STOP)
+                await self._task
+        except Exception:
+            logger.exception("Analytics drain task failed")
+        finally:
+            self._queue = None
+            self._task = None
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    async def _drain(self) -> None:
+        """
+        Collect up to batch_size records (or whatever arrives within
+        flush_interval) and write them with a single call off the event loop.
+        Writes are awaited one at a time, so batches stay in order.
+        A batch that fails (e.g. a record that is not JSON-serializable) is
+        logged and dropped; the task keeps draining.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            try:
+                await asyncio.to_thread(self._write, batch)
+            except Exception:
+                logger.exception("Analytics batch failed (%d records dropped)", len(batch))
+
+    def _open(self) -> int:
+        """
+        Return the append-only file descriptor, opening it on first use.
+        """
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        return self._fd
+
+    def _write(self, batch: List[Dict]) -> None:
+        """
+        Append a batch of records with as few os.write() calls as possible
+        (one, unless the kernel accepts a partial write).
+        """
+        payload = memoryview(b"\n".join(_dumps(r) for r in batch) + b"\n")
+        try:
+            fd = self._open()
+            while payload:
+                payload = payload[os.write(fd, payload):]
+        except OSError as e:
+            logger.error("Analytics write failed (%d records dropped): %s", len(batch), e)
\ No newline at end of file
@@ -6,64 +6,84 @@ logs analytics, and returns structured responses.
 """
 
 #imports
-import json
-from datetime import datetime
+import logging
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
 from pathlib import Path
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from bot import nlu, crm_client
-from bot.models import BotRequest, BotResponse
+from bot.analytics import AnalyticsWriter
+from bot.models import BotRequest, BotResponse, ErrorModel
 from bot.settings import logger
 
-# Initialize FastAPI application
-app = FastAPI(title="Voice-Style Bot Service")
-
 # Analytics log file (JSON Lines format)
 ANALYTICS_LOG = Path("analytics.jsonl")
+analytics = AnalyticsWriter(ANALYTICS_LOG)
+
+
+# Application lifespan: shared CRM HTTP client and analytics writer
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Open the shared CRM HTTP client and start the analytics writer on startup;
+    flush analytics and close the client on shutdown. CRM calls reach the
+    client through crm_client.get_client(); the lifespan only manages its
+    lifetime.
+    """
+    crm_client.get_client()
+    await analytics.start()
+    try:
+        yield
+    finally:
+        await analytics.stop()
+        await crm_client.close_client()
+
+
+# Initialize FastAPI application
+app = FastAPI(
+    title="Voice-Style Bot Service",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
 
 # Analytics logging
 def log_analytics(intent: str, entities: dict, success: bool):
     """
-    Append request/response analytics to a local JSONL file.
+    Queue request/response analytics for the local JSONL file.
     Args:
         intent (str): Detected intent from the transcript
         entities (dict): Extracted entities from the transcript
         success (bool): Whether the CRM action was successful
     """
     record = {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.now(timezone.utc),
         "intent": intent,
         "entities": entities,
         "success": success,
     }
-    with open(ANALYTICS_LOG, "a") as f:
-        f.write(json.dumps(record) + "\n")
+    analytics.log(record)
 
 
 # API Endpoint: /bot/handle
 @app.post("/bot/handle", response_model=BotResponse)
-def handle_bot(request: BotRequest):
+async def handle_bot(request: BotRequest) -> BotResponse:
     """
     Main bot handler endpoint.
+    Transcript length (max 1000 chars) is enforced by BotRequest validation.
     Workflow:
-    1. Validate transcript length
-    2. Parse transcript via NLU
-    3. Validate extracted entities
-    4. Call appropriate CRM operation based on intent
-    5. Log analytics
-    6. Return structured BotResponse
+    1. Parse transcript via NLU
+    2. Validate extracted entities
+    3. Call appropriate CRM operation based on intent
+    4. Log analytics
+    5. Return structured BotResponse
     """
-  
-    # Safety check
-    if len(request.transcript) > 1000:
-        raise HTTPException(
-            status_code=400,
-            detail="Transcript too long (max 1000 chars)"
-        )
 
-    logger.info(f"Received transcript: {request.transcript}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Received transcript: %s", request.transcript)
 
     # NLU parsing
-    nlu_result = nlu.parse_transcript(request.transcript)
+    nlu_result = await nlu.parse_transcript(request.transcript)
     intent = nlu_result["intent"]
     intent_confidence = nlu_result.get("intent_confidence")
     entities = nlu_result.get("entities") or {}
@@ -75,25 +95,28 @@ def handle_bot(request: BotRequest):
 
     # Handle validation errors
     if error:
-        logger.warning(f"Validation error: {error}")
+        logger.warning("Validation error: %s", error)
         log_analytics(intent, entities, success=False)
 
-        return BotResponse(
+        # Fields come straight from NLU, so skip re-validating them here.
+        # Nothing validates them later either: response_model serialization
+        # passes model_construct instances through unchecked.
+        return BotResponse.model_construct(
             intent=intent,
             intent_confidence=intent_confidence,
             entities=entities,
             crm_call=None,
             result=None,
-            error={
-                "type": error.get("type", "VALIDATION_ERROR"),
-                "details": error.get("details", "Required entities missing or invalid.")
-            }
+            error=ErrorModel.model_construct(
+                type=error.get("type", "VALIDATION_ERROR"),
+                details=error.get("details", "Required entities missing or invalid.")
+            )
         )
 
     # CRM Integration
     try:
         if intent == "LEAD_CREATE":
-            crm_response = crm_client.create_lead(
+            crm_response = await crm_client.create_lead(
                 name=entities.get("name", ""),
                 phone=entities.get("phone", ""),
                 city=entities.get("city", ""),
@@ -104,7 +127,7 @@ def handle_bot(request: BotRequest):
                 success = True
 
         elif intent == "VISIT_SCHEDULE":
-            crm_response = crm_client.schedule_visit(
+            crm_response = await crm_client.schedule_visit(
                 lead_id=entities.get("lead_id", ""),
                 visit_time=entities.get("visit_time", ""),
                 notes=entities.get("notes")
@@ -114,7 +137,7 @@ def handle_bot(request: BotRequest):
                 success = True
 
         elif intent == "LEAD_UPDATE":
-            crm_response = crm_client.update_lead_status(
+            crm_response = await crm_client.update_lead_status(
                 lead_id=entities.get("lead_id", ""),
                 status=entities.get("status", ""),
                 notes=entities.get("notes")
@@ -127,7 +150,7 @@ def handle_bot(request: BotRequest):
             result_message = "Unknown intent. No CRM action performed."
 
     except Exception as e:
-        logger.error(f"CRM call failed: {e}")
+        logger.error("CRM call failed: %s", e)
         crm_response = {
             "error": {
                 "type": "CRM_ERROR",
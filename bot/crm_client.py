@@ -1,36 +1,106 @@
 """
 CRM Client module:
-Provides functions to interact with the CRM system, including creating leads,
+Provides async functions to interact with the CRM system, including creating leads,
 scheduling visits, and updating lead status. Includes retry and timeout
-mechanisms for robust HTTP requests.
+mechanisms for robust HTTP requests over a shared httpx.AsyncClient.
 """
 
 #imports
-import requests
+import asyncio
+import httpx
 from typing import Optional, Dict
-from requests.adapters import HTTPAdapter, Retry
 from bot.settings import CRM_BASE_URL, logger
 
 # Configuration
 TIMEOUT = 5                 # seconds for HTTP requests
 RETRIES = 2                 # number of retries for failed requests
 BACKOFF_FACTOR = 1          # backoff factor for retry delays
+STATUS_FORCELIST = {500, 502, 503, 504}
 
-# HTTP session with retries
-session = requests.Session()
-retries = Retry(
-    total=RETRIES,
-    backoff_factor=BACKOFF_FACTOR,
-    status_forcelist=[500, 502, 503, 504],
-    allowed_methods=["POST"]
-)
-adapter = HTTPAdapter(max_retries=retries)
-session.mount("http://", adapter)
-session.mount("https://", adapter)
+# Connection pool (keep CRM sockets warm across requests)
+MAX_KEEPALIVE_CONNECTIONS = 64
+MAX_CONNECTIONS = 128
+KEEPALIVE_EXPIRY = 85.0     # seconds an idle connection is kept open
+HTTP2 = True                # negotiated via ALPN on https; http:// stays on HTTP/1.1
+
+# Shared async HTTP client (created lazily, closed by the app lifespan)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Return the shared CRM HTTP client, creating it on first use.
+    Retries (transport errors and retryable status codes) are handled in _post().
+    Returns:
+        httpx.AsyncClient: Client bound to CRM_BASE_URL
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            base_url=CRM_BASE_URL,
+            timeout=TIMEOUT,
+            headers={"Connection": "keep-alive"},
+            transport=httpx.AsyncHTTPTransport(
+                http2=HTTP2,
+                limits=httpx.Limits(
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                    max_connections=MAX_CONNECTIONS,
+                    keepalive_expiry=KEEPALIVE_EXPIRY
+                )
+            )
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """
+    Close the shared CRM HTTP client, if one was created.
+    """
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _backoff(retry: int) -> float:
+    """
+    Delay before the given retry (1-based), as urllib3 2.x computes it:
+    none before the first retry, then BACKOFF_FACTOR * 2 ** (retry - 1).
+    """
+    return 0 if retry <= 1 else BACKOFF_FACTOR * (2 ** (retry - 1))
+
+
+async def _post(path: str, payload: Dict) -> httpx.Response:
+    """
+    POST to the CRM with up to RETRIES retries and exponential backoff.
+    Transport errors (connect, read, timeout) and STATUS_FORCELIST responses
+    share the retry budget, as with the urllib3 Retry this replaces.
+    Args:
+        path (str): CRM endpoint path
+        payload (dict): JSON body
+    Returns:
+        httpx.Response: Final CRM response (status already checked)
+    """
+    client = get_client()
+    for attempt in range(RETRIES + 1):
+        if attempt:
+            await asyncio.sleep(_backoff(attempt))
+        try:
+            resp = await client.post(path, json=payload)
+        except httpx.TransportError as e:
+            if attempt == RETRIES:
+                raise
+            logger.debug("CRM POST %s failed (%s), retrying", path, e)
+            continue
+        if resp.status_code not in STATUS_FORCELIST or attempt == RETRIES:
+            break
+    logger.debug("CRM POST %s -> %s (%s)", path, resp.status_code, resp.http_version)
+    resp.raise_for_status()
+    return resp
 
 
 # CRM Operations
-def create_lead(name: str, phone: str, city: str, source: Optional[str] = None) -> Dict:
+async def create_lead(name: str, phone: str, city: str, source: Optional[str] = None) -> Dict:
     """
     Create a new lead in the CRM.
     Args:
@@ -41,26 +111,24 @@ def create_lead(name: str, phone: str, city: str, source: Optional[str] = None)
     Returns:
         dict: CRM API response or error dictionary
     """
-    url = f"{CRM_BASE_URL}/crm/leads"
     payload = {"name": name, "phone": phone, "city": city}
     if source:
         payload["source"] = source
 
     try:
-        resp = session.post(url, json=payload, timeout=TIMEOUT)
-        resp.raise_for_status()
+        resp = await _post("/crm/leads", payload)
         return {
             "endpoint": "/crm/leads",
             "method": "POST",
             "status_code": resp.status_code,
             "result": resp.json()
         }
-    except requests.RequestException as e:
-        logger.error(f"CRM create_lead failed: {e}")
+    except httpx.HTTPError as e:
+        logger.error("CRM create_lead failed: %s", e)
         return {"error": {"type": "CRM_ERROR", "details": str(e)}}
 
 
-def schedule_visit(lead_id: str, visit_time: str, notes: Optional[str] = None) -> Dict:
+async def schedule_visit(lead_id: str, visit_time: str, notes: Optional[str] = None) -> Dict:
     """
     Schedule a visit for a lead.
     Args:
@@ -70,26 +138,24 @@ def schedule_visit(lead_id: str, visit_time: str, notes: Optional[str] = None) -
     Returns:
         dict: CRM API response or error dictionary
     """
-    url = f"{CRM_BASE_URL}/crm/visits"
     payload = {"lead_id": lead_id, "visit_time": visit_time}
     if notes:
         payload["notes"] = notes
 
     try:
-        resp = session.post(url, json=payload, timeout=TIMEOUT)
-        resp.raise_for_status()
+        resp = await _post("/crm/visits", payload)
         return {
             "endpoint": "/crm/visits",
             "method": "POST",
             "status_code": resp.status_code,
             "result": resp.json()
         }
-    except requests.RequestException as e:
-        logger.error(f"CRM schedule_visit failed: {e}")
+    except httpx.HTTPError as e:
+        logger.error("CRM schedule_visit failed: %s", e)
         return {"error": {"type": "CRM_ERROR", "details": str(e)}}
 
 
-def update_lead_status(lead_id: str, status: str, notes: Optional[str] = None) -> Dict:
+async def update_lead_status(lead_id: str, status: str, notes: Optional[str] = None) -> Dict:
     """
     Update the status of an existing lead.
     Args:
@@ -99,51 +165,49 @@ def update_lead_status(lead_id: str, status: str, notes: Optional[str] = None) -
     Returns:
         dict: CRM API response or error dictionary
     """
-    url = f"{CRM_BASE_URL}/crm/leads/{lead_id}/status"
     payload = {"status": status}
     if notes:
         payload["notes"] = notes
 
     try:
-        resp = session.post(url, json=payload, timeout=TIMEOUT)
-        resp.raise_for_status()
+        resp = await _post(f"/crm/leads/{lead_id}/status", payload)
         return {
             "endpoint": f"/crm/leads/{lead_id}/status",
             "method": "POST",
             "status_code": resp.status_code,
             "result": resp.json()
         }
-    except requests.RequestException as e:
-        logger.error(f"CRM update_lead_status failed: {e}")
+    except httpx.HTTPError as e:
+        logger.error("CRM update_lead_status failed: %s", e)
         return {"error": {"type": "CRM_ERROR", "details": str(e)}}
 
 
 # Debug / Utility Helpers
-def list_leads() -> Dict:
+async def list_leads() -> Dict:
     """
     Fetch all leads from the CRM.
     Returns:
         dict: CRM API response or empty dict if failed
     """
     try:
-        resp = session.get(f"{CRM_BASE_URL}/crm/leads", timeout=TIMEOUT)
+        resp = await get_client().get("/crm/leads")
         resp.raise_for_status()
         return resp.json()
-    except requests.RequestException as e:
-        logger.warning(f"list_leads failed: {e}")
+    except httpx.HTTPError as e:
+        logger.warning("list_leads failed: %s", e)
         return {}
 
 
-def list_visits() -> Dict:
+async def list_visits() -> Dict:
     """
     Fetch all scheduled visits from the CRM.
     Returns:
         dict: CRM API response or empty dict if failed
     """
     try:
-        resp = session.get(f"{CRM_BASE_URL}/crm/visits", timeout=TIMEOUT)
+        resp = await get_client().get("/crm/visits")
         resp.raise_for_status()
         return resp.json()
-    except requests.RequestException as e:
-        logger.warning(f"list_visits failed: {e}")
+    except httpx.HTTPError as e:
+        logger.warning("list_visits failed: %s", e)
         return {}
\ No newline at end of file
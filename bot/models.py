@@ -6,8 +6,11 @@ between the API, NLU, and CRM client layers.
 """
 
 #imports
-from pydantic import BaseModel, Field, ValidationError
-from typing import Optional, Dict, List
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints
+from typing import Annotated, Optional, Dict, List
+
+# Maximum accepted transcript length (characters)
+MAX_TRANSCRIPT_LENGTH = 1000
 
 
 # Bot Request Model
@@ -15,20 +18,17 @@ class BotRequest(BaseModel):
     """
     Request model for the bot API.
     """
-    transcript: str = Field(..., description="User input text for the bot")
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
+    transcript: Annotated[
+        str, StringConstraints(max_length=MAX_TRANSCRIPT_LENGTH, strip_whitespace=True)
+    ] = Field(
+        ..., description=f"User input text for the bot (max {MAX_TRANSCRIPT_LENGTH} chars)"
+    )
     metadata: Optional[Dict[str, str]] = Field(
         None, description="Optional dictionary containing additional metadata"
     )
 
-    def __init__(self, **data):
-        """
-        Initialize BotRequest and catch validation errors to raise as ValueError.
-        """
-        try:
-            super().__init__(**data)
-        except ValidationError as e:
-            raise ValueError(f"Invalid BotRequest data: {e}")
-
 
 # Structured Error Model
 class ErrorModel(BaseModel):
@@ -49,6 +49,8 @@ class BotResponse(BaseModel):
     """
     Response model returned by the bot API.
     """
+    model_config = ConfigDict(extra="ignore", validate_assignment=False)
+
     intent: str = Field(..., description="Detected intent from transcript")
     intent_confidence: Optional[float] = Field(
         None, description="Confidence score of detected intent"
@@ -64,13 +66,4 @@ class BotResponse(BaseModel):
     )
     error: Optional[ErrorModel] = Field(
         None, description="Structured error details if something failed"
-    )
-
-    def __init__(self, **data):
-        """
-        Initialize BotResponse and catch validation errors to raise as ValueError.
-        """
-        try:
-            super().__init__(**data)
-        except ValidationError as e:
-            raise ValueError(f"Invalid BotResponse data: {e}")
\ No newline at end of file
+    )
\ No newline at end of file
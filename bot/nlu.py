@@ -6,17 +6,37 @@ for unrecognized transcripts. Supports LEAD_CREATE, VISIT_SCHEDULE, LEAD_UPDATE
 
 #imports
 import re
-import json
-from typing import Dict, Tuple, Optional
+import asyncio
+import hashlib
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple, Optional
 from datetime import datetime, timedelta
 import dateparser
-from openai import OpenAI
+import httpx
+from cachetools import TTLCache
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from bot import settings
 from bot.settings import logger
 
+try:
+    import hyperscan
+except ImportError:  # fall back to substring keyword scoring
+    hyperscan = None
 
-# Initialize OpenAI client
-client = OpenAI(api_key=settings.OPENAI_API_KEY)
+try:
+    from orjson import loads as json_loads
+except ImportError:  # stdlib fallback
+    from json import loads as json_loads
+
+
+# Initialize OpenAI client (async, bounded by LLM_TIMEOUT)
+client = AsyncOpenAI(
+    api_key=settings.OPENAI_API_KEY,
+    http_client=DefaultAsyncHttpxClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        timeout=settings.LLM_TIMEOUT
+    )
+)
 
 
 # Constants
@@ -25,29 +45,115 @@ INTENT_KEYWORDS = {
     "VISIT_SCHEDULE": ["schedule", "fix", "visit"],
     "LEAD_UPDATE": ["update", "mark"]
 }
+_INTENT_NAMES = tuple(INTENT_KEYWORDS)
+_INTENT_KEYWORD_GROUPS = tuple(tuple(k) for k in INTENT_KEYWORDS.values())
+_KEYWORD_INTENT_INDEX = tuple(i for i, group in enumerate(_INTENT_KEYWORD_GROUPS) for _ in group)
 
 PHONE_REGEX = r"(\+91[\-\s]?)?\d{10}"
-UUID_REGEX = r"[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+# Lead ids: canonical dashed UUIDs, or the compact 32-hex form the CRM issues
+UUID_REGEX = (
+    r"(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}"
+    r"|[0-9a-fA-F]{32})"
+)
+
+PARSE_CACHE_SIZE = 4096  # max transcripts kept by the rule-based parse cache
+LLM_CACHE_SIZE = 2048    # max LLM extractions kept in memory
+LLM_CACHE_TTL = 3600     # seconds an LLM extraction stays valid
 
 CITIES = ["Mumbai", "Delhi", "Gurgaon", "Bangalore", "Chennai", "Kolkata", "Pune"]
 STATUS_OPTIONS = ["NEW", "IN_PROGRESS", "FOLLOW_UP", "WON", "LOST"]
 
+# Precompiled patterns (compiled once at import, flags baked in)
+_VISIT_TIME_RE = re.compile(r"at (.+?)(?:\.|$)", re.IGNORECASE)
+_NOTES_RE = re.compile(r"notes[:\-]?\s*(.*)", re.IGNORECASE)
+_CLOCK_TIME_RE = re.compile(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?")
+
+# Single-pass scan for lead_id and phone, which cannot overlap each other.
+# name and source keep their own searches: finditer matches never overlap, so
+# a fused name branch could swallow the "Source" keyword (e.g. "Mumbai Source").
+_ENTITY_RE = re.compile(
+    rf"(?P<lead_id>{UUID_REGEX})"
+    rf"|(?P<phone>{PHONE_REGEX})"
+)
+_NAME_RE = re.compile(r"(?:name\s)?([A-Z][a-z]+\s[A-Z][a-z]+)")
+_SOURCE_RE = re.compile(r"source\s+(\w+)", re.IGNORECASE)
+_ENTITY_GROUPS = len(_ENTITY_RE.groupindex)
+
+_WORD_RE = re.compile(r"[a-z_]+")  # applied to the lowercased transcript
+
+# Lowercase token -> canonical value, for O(1) lookups per transcript word
+_CITY_TOKENS = {c.lower(): c for c in CITIES}
+_STATUS_TOKENS = {s.lower(): s for s in STATUS_OPTIONS}
+
+
+def _compile_intent_db():
+    """
+    Compile all intent keywords into one Hyperscan database (ids follow
+    _KEYWORD_INTENT_INDEX). The scratch space is reused by every scan, which
+    is safe because classification runs on the event loop thread only.
+    """
+    keywords = [k.encode() for group in _INTENT_KEYWORD_GROUPS for k in group]
+    db = hyperscan.Database()
+    db.compile(
+        expressions=keywords,
+        ids=list(range(len(keywords))),
+        elements=len(keywords),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(keywords)
+    )
+    return db, hyperscan.Scratch(db)
+
+
+_INTENT_DB, _INTENT_SCRATCH = _compile_intent_db() if hyperscan else (None, None)
+
 
 # Intent Classification
-def classify_intent(transcript: str) -> Tuple[str, float]:
+def _score_intents_substring(transcript_lower: str) -> Tuple[int, ...]:
     """
-    Classify the transcript into an intent based on keyword matches.
+    Count keyword hits per intent, in _INTENT_NAMES order (pure Python).
     Args:
-        transcript (str): User input text.
+        transcript_lower (str): Lowercased user input text.
+    Returns:
+        Tuple[int, ...]: Number of matching keywords for each intent.
+    """
+    return tuple(
+        sum(1 for k in keywords if k in transcript_lower)
+        for keywords in _INTENT_KEYWORD_GROUPS
+    )
+
+
+def _score_intents_hyperscan(transcript_lower: str) -> Tuple[int, ...]:
+    """
+    Count keyword hits per intent with one Hyperscan pass over the text.
+    SINGLEMATCH reports each keyword at most once, matching the substring scorer.
+    Args:
+        transcript_lower (str): Lowercased user input text.
+    Returns:
+        Tuple[int, ...]: Number of matching keywords for each intent.
+    """
+    counts = [0] * len(_INTENT_NAMES)
+
+    def on_match(keyword_id, start, end, flags, context):
+        counts[_KEYWORD_INTENT_INDEX[keyword_id]] += 1
+
+    _INTENT_DB.scan(transcript_lower.encode(), match_event_handler=on_match, scratch=_INTENT_SCRATCH)
+    return tuple(counts)
+
+
+_score_intents = _score_intents_hyperscan if _INTENT_DB is not None else _score_intents_substring
+
+
+def _best_intent(scores: Tuple[int, ...]) -> Tuple[str, float]:
+    """
+    Pick the highest-confidence intent from per-intent keyword scores.
+    Args:
+        scores (Tuple[int, ...]): Output of _score_intents().
     Returns:
         Tuple[str, float]: Detected intent and confidence score (0-1).
     """
-    transcript_lower = transcript.lower()
     best_intent = "UNKNOWN"
     best_conf = 0.3  # default low confidence
 
-    for intent, keywords in INTENT_KEYWORDS.items():
-        matches = sum(1 for k in keywords if k in transcript_lower)
+    for intent, matches in zip(_INTENT_NAMES, scores):
         if matches > 0:
             conf = min(1.0, 0.5 + 0.2 * matches)
             if conf > best_conf:
@@ -57,6 +163,31 @@ def classify_intent(transcript: str) -> Tuple[str, float]:
     return best_intent, best_conf
 
 
+def classify_intent(transcript: str, transcript_lower: Optional[str] = None) -> Tuple[str, float]:
+    """
+    Classify the transcript into an intent based on keyword matches.
+    Args:
+        transcript (str): User input text.
+        transcript_lower (Optional[str]): Precomputed transcript.lower(), if available.
+    Returns:
+        Tuple[str, float]: Detected intent and confidence score (0-1).
+    """
+    if transcript_lower is None:
+        transcript_lower = transcript.lower()
+    return _best_intent(_score_intents(transcript_lower))
+
+
+def classify_intents_batch(transcripts: Iterable[str]) -> List[Tuple[str, float]]:
+    """
+    Classify many transcripts at once (e.g. offline analytics rescoring).
+    Args:
+        transcripts (Iterable[str]): User input texts.
+    Returns:
+        List[Tuple[str, float]]: (intent, confidence) for each transcript, in order.
+    """
+    return [_best_intent(_score_intents(t.lower())) for t in transcripts]
+
+
 # Casual datetime parsing
 def parse_casual_datetime(text: str) -> Optional[str]:
     """
@@ -71,7 +202,7 @@ def parse_casual_datetime(text: str) -> Optional[str]:
 
     if "tomorrow" in text_lower:
         dt = now + timedelta(days=1)
-        time_match = re.search(r"(\d{1,2})(?::(\d{2}))?\s*(am|pm)?", text_lower)
+        time_match = _CLOCK_TIME_RE.search(text_lower)
         if time_match:
             hour = int(time_match.group(1))
             minute = int(time_match.group(2) or 0)
@@ -87,16 +218,72 @@ def parse_casual_datetime(text: str) -> Optional[str]:
     return None
 
 
+# ISO-8601 fast path
+def parse_iso_datetime(text: str) -> Optional[str]:
+    """
+    Parse an ISO-8601 timestamp with the C-accelerated datetime.fromisoformat,
+    avoiding dateparser's heuristics for the common exact-time case.
+    Naive values are taken as local time, matching dateparser's
+    RETURN_AS_TIMEZONE_AWARE behaviour.
+    Args:
+        text (str): Candidate timestamp, e.g. '2025-10-02T17:00:00+05:30'.
+    Returns:
+        Optional[str]: ISO formatted datetime if the text is ISO-8601, else None.
+    """
+    try:
+        dt = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.astimezone()
+    return dt.isoformat()
+
+
 # Entity Extraction
-def extract_entities(transcript: str, intent: str) -> Tuple[Dict[str, Optional[str]], Optional[Dict]]:
+def _first_token_match(tokens: Dict[str, str], transcript_lower: str) -> Optional[str]:
+    """
+    Return the canonical value of the first transcript word found in tokens.
+    Args:
+        tokens (Dict[str, str]): Lowercase token to canonical value mapping.
+        transcript_lower (str): Lowercased user input text.
+    Returns:
+        Optional[str]: Canonical value of the earliest matching word, else None.
+    """
+    return next((tokens[w] for w in _WORD_RE.findall(transcript_lower) if w in tokens), None)
+
+
+def _scan_entities(transcript: str) -> Dict[str, str]:
+    """
+    Walk the transcript once with _ENTITY_RE and keep the first match per group.
+    Args:
+        transcript (str): User input text.
+    Returns:
+        Dict[str, str]: First lead_id and phone found (if any).
+    """
+    found: Dict[str, str] = {}
+    for match in _ENTITY_RE.finditer(transcript):
+        group = match.lastgroup
+        if group not in found:
+            found[group] = match.group(group)
+            if len(found) == _ENTITY_GROUPS:
+                break
+    return found
+
+
+def extract_entities(
+    transcript: str, intent: str, transcript_lower: Optional[str] = None
+) -> Tuple[Dict[str, Optional[str]], Optional[Dict]]:
     """
     Extract entities from transcript based on intent.
     Args:
         transcript (str): User input text.
         intent (str): Detected intent.
+        transcript_lower (Optional[str]): Precomputed transcript.lower(), if available.
     Returns:
         Tuple[Dict[str, Optional[str]], Optional[Dict]]: Extracted entities and error info.
     """
+    if transcript_lower is None:
+        transcript_lower = transcript.lower()
     entities: Dict[str, Optional[str]] = {
         "name": None,
         "phone": None,
@@ -108,27 +295,24 @@ def extract_entities(transcript: str, intent: str) -> Tuple[Dict[str, Optional[s
         "notes": None
     }
     error_fields = []
+    found = _scan_entities(transcript)
 
     # Extract phone
-    phone_match = re.search(PHONE_REGEX, transcript)
-    if phone_match:
-        entities["phone"] = phone_match.group()
-    elif intent == "LEAD_CREATE":
+    entities["phone"] = found.get("phone")
+    if not entities["phone"] and intent == "LEAD_CREATE":
         error_fields.append("phone")
 
     # Extract lead_id
-    lead_id_match = re.search(UUID_REGEX, transcript)
-    if lead_id_match:
-        entities["lead_id"] = lead_id_match.group()
-    elif intent in ["VISIT_SCHEDULE", "LEAD_UPDATE"]:
+    entities["lead_id"] = found.get("lead_id")
+    if not entities["lead_id"] and intent in ["VISIT_SCHEDULE", "LEAD_UPDATE"]:
         error_fields.append("lead_id")
 
     # VISIT_SCHEDULE: extract visit_time and notes
     if intent == "VISIT_SCHEDULE":
-        time_match = re.search(r"at (.+?)(?:\.|$)", transcript, re.IGNORECASE)
+        time_match = _VISIT_TIME_RE.search(transcript)
         if time_match:
             dt_str = time_match.group(1).strip()
-            dt = parse_casual_datetime(dt_str)
+            dt = parse_casual_datetime(dt_str) or parse_iso_datetime(dt_str)
             if not dt:
                 parsed = dateparser.parse(
                     dt_str,
@@ -146,39 +330,33 @@ def extract_entities(transcript: str, intent: str) -> Tuple[Dict[str, Optional[s
         else:
             error_fields.append("visit_time")
 
-        notes_match = re.search(r"notes[:\-]?\s*(.*)", transcript, re.IGNORECASE)
+        notes_match = _NOTES_RE.search(transcript)
         if notes_match:
             entities["notes"] = notes_match.group(1).strip()
 
     # LEAD_UPDATE: extract status and notes
     if intent == "LEAD_UPDATE":
-        for s in STATUS_OPTIONS:
-            if s.lower() in transcript.lower():
-                entities["status"] = s
-                break
+        entities["status"] = _first_token_match(_STATUS_TOKENS, transcript_lower)
         if not entities["status"]:
             error_fields.append("status")
 
-        notes_match = re.search(r"notes[:\-]?\s*(.*)", transcript, re.IGNORECASE)
+        notes_match = _NOTES_RE.search(transcript)
         if notes_match:
             entities["notes"] = notes_match.group(1).strip()
 
     # LEAD_CREATE: extract name, city, source
     if intent == "LEAD_CREATE":
-        name_match = re.search(r"(?:name\s)?([A-Z][a-z]+\s[A-Z][a-z]+)", transcript)
+        name_match = _NAME_RE.search(transcript)
         if name_match:
             entities["name"] = name_match.group(1)
         else:
             error_fields.append("name")
 
-        for city in CITIES:
-            if city.lower() in transcript.lower():
-                entities["city"] = city
-                break
-        else:
+        entities["city"] = _first_token_match(_CITY_TOKENS, transcript_lower)
+        if not entities["city"]:
             error_fields.append("city")
 
-        source_match = re.search(r"source\s+(\w+)", transcript, re.IGNORECASE)
+        source_match = _SOURCE_RE.search(transcript)
         if source_match:
             entities["source"] = source_match.group(1)
 
@@ -187,9 +365,14 @@ def extract_entities(transcript: str, intent: str) -> Tuple[Dict[str, Optional[s
 
 
 # LLM-based Extraction Fallback
-def extract_with_llm(transcript: str) -> Dict:
+_llm_cache: TTLCache = TTLCache(maxsize=LLM_CACHE_SIZE, ttl=LLM_CACHE_TTL)
+
+
+async def extract_with_llm(transcript: str) -> Dict:
     """
     Use OpenAI LLM to extract intent and entities as a fallback.
+    Successful extractions are cached per transcript for LLM_CACHE_TTL seconds,
+    and the call is abandoned after settings.LLM_TIMEOUT seconds.
     Args:
         transcript (str): User input text.
     Returns:
@@ -206,21 +389,52 @@ def extract_with_llm(transcript: str) -> Dict:
     Entities keys: [name, phone, city, lead_id, visit_time, status, source, notes].
     If a field is missing, return null for that key.
     """
+    key = hashlib.blake2b(transcript.encode()).digest()
+    cached = _llm_cache.get(key)
+    if cached is not None:
+        return cached
+
     try:
-        response = client.chat.completions.create(
-            model=settings.LLM_MODEL,
-            messages=[{"role": "system", "content": prompt}],
-            temperature=0
+        response = await asyncio.wait_for(
+            client.chat.completions.create(
+                model=settings.LLM_MODEL,
+                messages=[{"role": "system", "content": prompt}],
+                temperature=0
+            ),
+            timeout=settings.LLM_TIMEOUT
         )
         content = response.choices[0].message.content
-        return json.loads(content)
+        result = json_loads(content)
+        _llm_cache[key] = result
+        return result
     except Exception as e:
-        logger.error(f"LLM extraction failed: {e}")
+        logger.error("LLM extraction failed: %s", e)
         return {"intent": "UNKNOWN", "entities": {}}
 
 
+# Cached rule-based parsing
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_rules(transcript: str) -> Tuple[str, float, Optional[Dict], Optional[Dict]]:
+    """
+    Run the deterministic rule-based NLU, memoized per transcript.
+    VISIT_SCHEDULE entities are not cached (returned as None) because
+    relative times like 'tomorrow 5pm' depend on the current clock.
+    Cached dicts must never be handed out directly; see parse_transcript().
+    Args:
+        transcript (str): User input text.
+    Returns:
+        Tuple: (intent, confidence, entities or None, error or None)
+    """
+    transcript_lower = transcript.lower()
+    intent, confidence = classify_intent(transcript, transcript_lower)
+    if intent == "VISIT_SCHEDULE":
+        return intent, confidence, None, None
+    entities, error = extract_entities(transcript, intent, transcript_lower)
+    return intent, confidence, entities, error
+
+
 # Main NLU Entry Point
-def parse_transcript(transcript: str) -> Dict:
+async def parse_transcript(transcript: str) -> Dict:
     """
     Parse transcript to detect intent, extract entities, and return structured result.
     Args:
@@ -233,17 +447,23 @@ def parse_transcript(transcript: str) -> Dict:
             "error": Optional[dict]
         }
     """
-    intent, confidence = classify_intent(transcript)
-    entities, error = extract_entities(transcript, intent)
+    intent, confidence, entities, error = _parse_rules(transcript)
+    if entities is None:
+        entities, error = extract_entities(transcript, intent)
+    else:
+        # Copy cached values so callers can't mutate the cache
+        entities = dict(entities)
+        if error:
+            error = {**error, "missing_fields": list(error["missing_fields"])}
 
     # Fallback to LLM if rules fail completely
     if intent == "UNKNOWN" and all(v is None for v in entities.values()):
         logger.info("Falling back to LLM for NLU...")
-        llm_result = extract_with_llm(transcript)
+        llm_result = await extract_with_llm(transcript)
         return {
             "intent": llm_result.get("intent", "UNKNOWN"),
             "intent_confidence": 0.7,
-            "entities": llm_result.get("entities", {}),
+            "entities": dict(llm_result.get("entities") or {}),
             "error": None
         }
 
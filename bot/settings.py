@@ -6,7 +6,10 @@ for CRM integration and OpenAI LLM usage.
 
 #imports
 import os
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from dotenv import load_dotenv
 
 # Load Environment Variables
@@ -19,11 +22,14 @@ LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 # OpenAI LLM Configuration
 OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
 LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4o-mini")
+LLM_TIMEOUT: float = float(os.getenv("LLM_TIMEOUT", "4.0"))  # seconds
 
 # Logging Setup
 def configure_logging(name: str = "bot") -> logging.Logger:
     """
     Configure and return a logger instance with stream output.
+    Records are handed to a QueueHandler and written by a background
+    QueueListener thread, so logging never blocks the event loop on I/O.
     Args:
         name (str): Logger name. Defaults to 'bot'.
     Returns:
@@ -45,7 +51,13 @@ def configure_logging(name: str = "bot") -> logging.Logger:
             "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
         )
         ch.setFormatter(formatter)
-        logger.addHandler(ch)
+
+        # Queue handler on the logger; the listener thread owns the stream
+        log_queue = queue.SimpleQueue()
+        listener = QueueListener(log_queue, ch, respect_handler_level=True)
+        listener.start()
+        atexit.register(listener.stop)
+        logger.addHandler(QueueHandler(log_queue))
 
         # Prevent propagation to root logger
         logger.propagate = False
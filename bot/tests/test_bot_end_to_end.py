@@ -6,10 +6,12 @@ End-to-end tests for the Bot Service.
 #imports
 import os
 import json
+import asyncio
 import pytest
 from unittest.mock import patch
 from fastapi.testclient import TestClient
 from bot.app import app
+from bot.analytics import AnalyticsWriter
 
 # FastAPI test client
 client = TestClient(app)
@@ -207,6 +209,14 @@ def test_missing_required_entity():
     assert data["intent"] == "LEAD_CREATE"
     assert data["error"]["type"] == "VALIDATION_ERROR"
 
+def test_transcript_too_long():
+    """
+    Test that transcripts over 1000 characters are rejected by request validation.
+    """
+    response = client.post("/bot/handle", json={"transcript": "a" * 1001})
+
+    assert response.status_code == 422
+
 @patch("bot.nlu.parse_transcript", side_effect=mock_parse_transcript)
 @patch("bot.crm_client.update_lead_status")
 def test_crm_error(mock_crm, mock_nlu):
@@ -222,4 +232,38 @@ def test_crm_error(mock_crm, mock_nlu):
 
     assert response.status_code == 200
     assert data["intent"] == "LEAD_UPDATE"
-    assert data["error"]["type"] == "CRM_ERROR"
\ No newline at end of file
+    assert data["error"]["type"] == "CRM_ERROR"
+
+def test_analytics_flushed_on_shutdown():
+    """
+    Test that analytics buffered by the background writer are flushed
+    when the application shuts down.
+    """
+    transcript = "Add a new lead with no phone number"
+    with TestClient(app) as lifespan_client:
+        response = lifespan_client.post("/bot/handle", json={"transcript": transcript})
+        assert response.status_code == 200
+
+    last_entry = read_last_analytics_entry()
+    assert last_entry["intent"] == "LEAD_CREATE"
+    assert last_entry["success"] is False
+
+
+def test_analytics_survives_bad_record(tmp_path):
+    """
+    Test that a batch that cannot be serialized is dropped without
+    stopping the writer, so later records are still written.
+    """
+    path = tmp_path / "analytics.jsonl"
+
+    async def run():
+        writer = AnalyticsWriter(path, flush_interval=0.01)
+        await writer.start()
+        writer.log({"intent": object()})
+        await asyncio.sleep(0.05)
+        writer.log({"intent": "LEAD_CREATE"})
+        await writer.stop()
+
+    asyncio.run(run())
+    lines = path.read_text().strip().split("\n")
+    assert [json.loads(line)["intent"] for line in lines] == ["LEAD_CREATE"]
\ No newline at end of file
@@ -0,0 +1,109 @@
+"""
+Tests for the CRM client's retry behaviour.
+
+"""
+
+#imports
+import asyncio
+from unittest.mock import AsyncMock, patch
+import httpx
+import pytest
+from bot import crm_client
+
+
+@pytest.fixture
+def crm(monkeypatch):
+    """
+    Route the shared CRM client through an httpx.MockTransport.
+    Set `responses` to the statuses (or exceptions) to return in order; the
+    last one repeats. Yields the call log and the patched asyncio.sleep.
+    """
+    calls = []
+    responses = []
+
+    def handler(request):
+        calls.append(request)
+        outcome = responses[min(len(calls), len(responses)) - 1]
+        if isinstance(outcome, Exception):
+            raise outcome
+        return httpx.Response(outcome, json={"lead_id": "abc", "status": "NEW"})
+
+    client = httpx.AsyncClient(base_url="http://crm.test", transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(crm_client, "_client", client)
+    with patch.object(crm_client.asyncio, "sleep", new_callable=AsyncMock) as sleep:
+        yield calls, responses, sleep
+    asyncio.run(client.aclose())
+
+
+def create_lead():
+    """Run crm_client.create_lead with a fixed payload."""
+    return asyncio.run(crm_client.create_lead("Rohan Sharma", "9876543210", "Pune"))
+
+
+def test_server_error_is_retried_then_reported(crm):
+    """
+    A persistent 503 is retried RETRIES times with urllib3-style backoff,
+    then surfaces as CRM_ERROR.
+    """
+    calls, responses, sleep = crm
+    responses.append(503)
+
+    result = create_lead()
+
+    assert len(calls) == crm_client.RETRIES + 1
+    assert [c.args[0] for c in sleep.await_args_list] == [0, 2]
+    assert result["error"]["type"] == "CRM_ERROR"
+
+
+def test_client_error_is_not_retried(crm):
+    """
+    A 4xx response is returned after a single attempt as CRM_ERROR.
+    """
+    calls, responses, sleep = crm
+    responses.append(404)
+
+    result = create_lead()
+
+    assert len(calls) == 1
+    sleep.assert_not_awaited()
+    assert result["error"]["type"] == "CRM_ERROR"
+
+
+def test_retry_recovers_after_server_error(crm):
+    """
+    A 503 followed by a 200 returns the successful response.
+    """
+    calls, responses, _ = crm
+    responses.extend([503, 200])
+
+    result = create_lead()
+
+    assert len(calls) == 2
+    assert result["status_code"] == 200
+    assert result["result"] == {"lead_id": "abc", "status": "NEW"}
+
+
+def test_read_timeout_is_retried(crm):
+    """
+    Read timeouts on POST are retried like the urllib3 Retry they replaced.
+    """
+    calls, responses, _ = crm
+    responses.extend([httpx.ReadTimeout("timed out"), 200])
+
+    result = create_lead()
+
+    assert len(calls) == 2
+    assert result["status_code"] == 200
+
+
+def test_connect_errors_exhaust_retries(crm):
+    """
+    Connection failures use the same retry budget, then surface as CRM_ERROR.
+    """
+    calls, responses, _ = crm
+    responses.append(httpx.ConnectError("refused"))
+
+    result = create_lead()
+
+    assert len(calls) == crm_client.RETRIES + 1
+    assert result["error"]["type"] == "CRM_ERROR"
\ No newline at end of file
@@ -0,0 +1,255 @@
+"""
+Tests for the mock CRM service: request validation, error responses and
+the Redis storage backend (on an in-process fake Redis).
+
+"""
+
+#imports
+from datetime import datetime, timezone
+import pytest
+from fastapi.testclient import TestClient
+import mock_crm
+
+client = TestClient(mock_crm.app)
+
+LEAD = {"name": "Rohan Sharma", "phone": "9876543210", "city": "Gurgaon"}
+
+
+@pytest.fixture
+def redis_crm(monkeypatch):
+    """
+    Serve the app from a RedisStore on an in-process fake Redis.
+    Yields a client for the app and a sync client for inspecting stored hashes.
+    """
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # Lua scripting support in the fake
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        mock_crm.aioredis, "from_url",
+        lambda url, **kwargs: fakeredis.FakeAsyncRedis(server=server, **kwargs)
+    )
+    monkeypatch.setattr(mock_crm, "store", mock_crm.RedisStore("redis://fake"))
+    with TestClient(mock_crm.app) as redis_client:
+        yield redis_client, fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+def create_lead():
+    """Create a lead and return its id."""
+    response = client.post("/crm/leads", json=LEAD)
+    assert response.status_code == 200
+    return response.json()["lead_id"]
+
+
+def post_raw(path, body):
+    """POST a raw JSON body."""
+    return client.post(path, content=body, headers={"content-type": "application/json"})
+
+
+def test_create_lead():
+    """
+    A valid lead is stored and its id returned with status NEW.
+    """
+    response = client.post("/crm/leads", json=LEAD)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    body = response.json()
+    assert body["status"] == "NEW"
+    assert len(body["lead_id"]) == 32
+
+
+def test_extra_field_is_rejected():
+    """
+    Unknown fields are reported with FastAPI's 422 shape under "body".
+    """
+    response = client.post("/crm/leads", json={**LEAD, "email": "a@b.c"})
+
+    assert response.status_code == 422
+    error, = response.json()["detail"]
+    assert error["type"] == "extra_forbidden"
+    assert error["loc"] == ["body", "email"]
+
+
+def test_missing_field_is_rejected():
+    """
+    Missing required fields are reported by name.
+    """
+    response = client.post("/crm/leads", json={"name": "Rohan Sharma"})
+
+    assert response.status_code == 422
+    assert [e["loc"] for e in response.json()["detail"]] == [["body", "phone"], ["body", "city"]]
+
+
+def test_empty_body_is_rejected():
+    """
+    An empty body is invalid JSON at the body location.
+    """
+    response = post_raw("/crm/leads", b"")
+
+    assert response.status_code == 422
+    error, = response.json()["detail"]
+    assert error["type"] == "json_invalid"
+    assert error["loc"] == ["body"]
+
+
+def test_non_object_body_is_rejected():
+    """
+    JSON that is not an object fails as a whole body.
+    """
+    for body in (b"[1]", b"null", b'"lead"'):
+        response = post_raw("/crm/leads", body)
+
+        assert response.status_code == 422
+        error, = response.json()["detail"]
+        assert error["type"] == "dict_type"
+        assert error["loc"] == ["body"]
+
+
+def test_schedule_visit():
+    """
+    A visit for an existing lead is stored with its parsed visit time.
+    """
+    lead_id = create_lead()
+    response = client.post(
+        "/crm/visits", json={"lead_id": lead_id, "visit_time": "2025-10-02T17:00:00+05:30"}
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["status"] == "SCHEDULED"
+    assert mock_crm.VISITS[body["visit_id"]]["visit_time"].isoformat() == "2025-10-02T17:00:00+05:30"
+
+
+def test_bad_visit_time_is_rejected():
+    """
+    A visit time that is not a datetime is a 422 on visit_time.
+    """
+    response = client.post("/crm/visits", json={"lead_id": create_lead(), "visit_time": "tomorrow"})
+
+    assert response.status_code == 422
+    error, = response.json()["detail"]
+    assert error["loc"] == ["body", "visit_time"]
+
+
+def test_visit_for_unknown_lead():
+    """
+    Scheduling a visit for an unknown lead is a 404.
+    """
+    response = client.post("/crm/visits", json={"lead_id": "missing", "visit_time": "2025-10-02T17:00:00"})
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Lead not found"}
+
+
+def test_update_lead_status():
+    """
+    A status update replaces the status and notes of the lead.
+    """
+    lead_id = create_lead()
+    response = client.post(f"/crm/leads/{lead_id}/status", json={"status": "WON", "notes": "Booked"})
+
+    assert response.status_code == 200
+    assert response.json() == {"lead_id": lead_id, "status": "WON"}
+    assert mock_crm.LEADS[lead_id]["notes"] == "Booked"
+
+    client.post(f"/crm/leads/{lead_id}/status", json={"status": "LOST"})
+    assert mock_crm.LEADS[lead_id]["status"] == "LOST"
+    assert mock_crm.LEADS[lead_id]["notes"] is None
+
+
+def test_bad_status_is_rejected():
+    """
+    A status outside the allowed values is a 422 on status.
+    """
+    response = client.post(f"/crm/leads/{create_lead()}/status", json={"status": "MAYBE"})
+
+    assert response.status_code == 422
+    error, = response.json()["detail"]
+    assert error["type"] == "literal_error"
+    assert error["loc"] == ["body", "status"]
+
+
+def test_status_update_for_unknown_lead():
+    """
+    Updating an unknown lead is a 404.
+    """
+    response = client.post("/crm/leads/missing/status", json={"status": "WON"})
+
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Lead not found"}
+
+
+def test_openapi_documents_request_bodies():
+    """
+    The hand-validated routes still publish their body schemas.
+    """
+    paths = client.get("/openapi.json").json()["paths"]
+
+    for path, title in (
+        ("/crm/leads", "LeadCreate"),
+        ("/crm/visits", "VisitCreate"),
+        ("/crm/leads/{lead_id}/status", "LeadStatusUpdate"),
+    ):
+        body = paths[path]["post"]["requestBody"]
+        assert body["required"] is True
+        assert body["content"]["application/json"]["schema"]["title"] == title
+
+
+def test_redis_mapping_drops_none_and_serializes_datetimes():
+    """
+    Hash mappings omit None values and store datetimes as ISO-8601 strings.
+    """
+    visit_time = datetime(2025, 10, 2, 11, 30, tzinfo=timezone.utc)
+    mapping = mock_crm.RedisStore._mapping({"lead_id": "abc", "visit_time": visit_time, "notes": None})
+
+    assert mapping == {"lead_id": "abc", "visit_time": "2025-10-02T11:30:00+00:00"}
+
+
+def test_redis_store_lead_and_visit(redis_crm):
+    """
+    Leads and visits are stored as hashes keyed by their ids.
+    """
+    redis_client, redis = redis_crm
+    lead_id = redis_client.post("/crm/leads", json={**LEAD, "source": None}).json()["lead_id"]
+    visit_id = redis_client.post(
+        "/crm/visits", json={"lead_id": lead_id, "visit_time": "2025-10-02T17:00:00+05:30"}
+    ).json()["visit_id"]
+
+    assert redis.hgetall(f"lead:{lead_id}") == {**LEAD, "lead_id": lead_id, "status": "NEW"}
+    assert redis.hgetall(f"visit:{visit_id}") == {
+        "lead_id": lead_id,
+        "visit_time": "2025-10-02T17:00:00+05:30",
+        "visit_id": visit_id,
+        "status": "SCHEDULED",
+    }
+
+
+def test_redis_status_update_clears_notes(redis_crm):
+    """
+    A status update without notes removes the notes field from the hash.
+    """
+    redis_client, redis = redis_crm
+    lead_id = redis_client.post("/crm/leads", json=LEAD).json()["lead_id"]
+
+    redis_client.post(f"/crm/leads/{lead_id}/status", json={"status": "WON", "notes": "Booked"})
+    assert redis.hget(f"lead:{lead_id}", "notes") == "Booked"
+
+    response = redis_client.post(f"/crm/leads/{lead_id}/status", json={"status": "LOST"})
+    assert response.json() == {"lead_id": lead_id, "status": "LOST"}
+    stored = redis.hgetall(f"lead:{lead_id}")
+    assert stored["status"] == "LOST"
+    assert "notes" not in stored
+
+
+def test_redis_status_update_for_unknown_lead(redis_crm):
+    """
+    Updating a missing lead is a 404 and does not create a partial hash.
+    """
+    redis_client, redis = redis_crm
+    response = redis_client.post("/crm/leads/missing/status", json={"status": "WON"})
+
+    assert response.status_code == 404
+    assert not redis.exists("lead:missing")
+    assert redis_client.post(
+        "/crm/visits", json={"lead_id": "missing", "visit_time": "2025-10-02T17:00:00"}
+    ).status_code == 404
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""
+Unit tests for the rule-based NLU.
+
+"""
+
+#imports
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+import pytest
+from bot import nlu
+
+LEAD_ID = "604bc047-98d8-47f6-8970-d2f0d7c6658a"
+
+
+def test_status_uses_first_mention():
+    """
+    The status mentioned first wins over words that appear later in notes.
+    """
+    entities, error = nlu.extract_entities(
+        f"Update lead {LEAD_ID} to WON. Notes: new unit booked", "LEAD_UPDATE"
+    )
+
+    assert error is None
+    assert entities["status"] == "WON"
+    assert entities["notes"] == "new unit booked"
+
+
+def test_city_is_case_insensitive():
+    """
+    Cities are matched regardless of case and returned in canonical form.
+    """
+    entities, error = nlu.extract_entities(
+        "add new lead Amit Kumar pune 9000000001", "LEAD_CREATE"
+    )
+
+    assert error is None
+    assert entities["city"] == "Pune"
+
+
+def test_status_matches_whole_words_only():
+    """
+    Status keywords inside longer words (e.g. 'renewal') are not matches.
+    """
+    entities, error = nlu.extract_entities(
+        f"Update lead {LEAD_ID} for renewal", "LEAD_UPDATE"
+    )
+
+    assert entities["status"] is None
+    assert error["missing_fields"] == ["status"]
+
+
+def test_parse_transcript_cache_returns_copies():
+    """
+    Repeated transcripts are served from the cache without sharing state.
+    """
+    transcript = "Add a new lead with no phone number"
+    first = asyncio.run(nlu.parse_transcript(transcript))
+    first["entities"]["name"] = "Changed"
+    first["error"]["missing_fields"].clear()
+
+    second = asyncio.run(nlu.parse_transcript(transcript))
+
+    assert second["entities"]["name"] is None
+    assert second["error"]["missing_fields"] == ["phone", "name", "city"]
+
+
+def test_classify_intents_batch_matches_single():
+    """
+    Batch classification returns the same results as classify_intent.
+    """
+    transcripts = [
+        "Add a new lead: Rohan Sharma from Gurgaon, phone 9876543210",
+        f"Schedule a visit for lead {LEAD_ID} at tomorrow 5pm",
+        f"Update lead {LEAD_ID} to WON",
+        "Hello there",
+    ]
+
+    batch = nlu.classify_intents_batch(transcripts)
+
+    assert batch == [nlu.classify_intent(t) for t in transcripts]
+    assert [intent for intent, _ in batch] == [
+        "LEAD_CREATE", "VISIT_SCHEDULE", "LEAD_UPDATE", "UNKNOWN"
+    ]
+
+
+def test_lead_id_digits_are_not_a_phone():
+    """
+    Digits inside a lead id are consumed by the lead_id match, not read as a phone.
+    """
+    lead_id = "00000000-0000-0000-0000-000000000000"
+    entities, error = nlu.extract_entities(f"Update lead {lead_id} to LOST", "LEAD_UPDATE")
+
+    assert error is None
+    assert entities["lead_id"] == lead_id
+    assert entities["phone"] is None
+
+
+def test_source_after_capitalised_word():
+    """
+    A capitalised word before "Source" does not hide the source from extraction.
+    """
+    entities, error = nlu.extract_entities(
+        "Add Rohan Sharma in Mumbai Source Instagram phone 9876543210", "LEAD_CREATE"
+    )
+
+    assert error is None
+    assert entities["city"] == "Mumbai"
+    assert entities["source"] == "Instagram"
+    assert entities["phone"] == "9876543210"
+
+
+def test_compact_lead_id_is_recognized():
+    """
+    Lead ids in the CRM's compact 32-hex form are extracted like dashed UUIDs.
+    """
+    lead_id = "604bc04798d847f68970d2f0d7c6658a"
+    entities, error = nlu.extract_entities(f"Update lead {lead_id} to WON", "LEAD_UPDATE")
+
+    assert error is None
+    assert entities["lead_id"] == lead_id
+
+
+@pytest.mark.skipif(nlu._INTENT_DB is None, reason="hyperscan not installed")
+def test_hyperscan_scores_match_substring_scores():
+    """
+    The Hyperscan scorer counts the same keywords as the substring scorer.
+    """
+    transcripts = [
+        "add a new lead and create it, add again",
+        "schedule a visit, fix the visit time",
+        "update and mark lead",
+        "nothing relevant here",
+    ]
+
+    for t in transcripts:
+        assert nlu._score_intents_hyperscan(t) == nlu._score_intents_substring(t)
+
+
+def test_llm_fallback_is_cached():
+    """
+    A repeated unrecognized transcript reuses the cached LLM extraction.
+    """
+    content = '{"intent": "LEAD_CREATE", "entities": {"name": "Asha Rao"}}'
+    reply = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+    transcript = "Hello, please onboard Asha"
+
+    with patch.object(nlu.client.chat.completions, "create", AsyncMock(return_value=reply)) as create:
+        first = asyncio.run(nlu.parse_transcript(transcript))
+        second = asyncio.run(nlu.parse_transcript(transcript))
+
+    assert create.await_count == 1
+    assert first["intent"] == second["intent"] == "LEAD_CREATE"
+    assert second["entities"] == {"name": "Asha Rao"}
\ No newline at end of file
@@ -1,79 +1,228 @@
 """
 Mock CRM Service
-Provides in-memory endpoints for testing CRM operations:
+Provides endpoints for testing CRM operations:
 - Lead creation
 - Visit scheduling
 - Lead status update
+Data lives in per-process dicts by default; set REDIS_URL to share it
+across workers through Redis.
 """
 
 #imports
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import ConfigDict, Field, TypeAdapter, ValidationError
 from uuid import uuid4
-from typing import Optional
+from typing import Annotated, Dict, Literal, Optional
+from typing_extensions import NotRequired, TypedDict
 from datetime import datetime
+import redis.asyncio as aioredis
 
-# Initialize FastAPI app
-app = FastAPI(title="Mock CRM Service")
+# Configuration
+REDIS_URL: Optional[str] = os.getenv("REDIS_URL")
+
+# Pre-encoded response bodies; uuid4().hex ids never need JSON escaping
+_CREATE_LEAD_PREFIX = b'{"lead_id":"'
+_CREATE_LEAD_SUFFIX = b'","status":"NEW"}'
+_CREATE_VISIT_PREFIX = b'{"visit_id":"'
+_CREATE_VISIT_SUFFIX = b'","status":"SCHEDULED"}'
 
-# Pydantic Models
-class LeadCreate(BaseModel):
+# Request schemas: TypedDicts validated straight from the raw body bytes
+# by module-level TypeAdapters, so handlers get plain dicts and no model
+# instance is built per request.
+class LeadCreate(TypedDict):
     """Payload for creating a new lead."""
+    __pydantic_config__ = ConfigDict(extra="forbid")
+
     name: str
     phone: str
     city: str
-    source: Optional[str] = None
+    source: NotRequired[Optional[str]]
 
-class VisitCreate(BaseModel):
+class VisitCreate(TypedDict):
     """Payload for scheduling a visit for an existing lead."""
+    __pydantic_config__ = ConfigDict(extra="forbid")
+
     lead_id: str
     visit_time: datetime
-    notes: Optional[str] = None
+    notes: NotRequired[Optional[str]]
 
-class LeadStatusUpdate(BaseModel):
+class LeadStatusUpdate(TypedDict):
     """Payload for updating the status of an existing lead."""
-    status: str = Field(
-        pattern="^(NEW|IN_PROGRESS|FOLLOW_UP|WON|LOST)$",
-        description="Lead status must be one of: NEW, IN_PROGRESS, FOLLOW_UP, WON, LOST"
-    )
-    notes: Optional[str] = None
+    __pydantic_config__ = ConfigDict(extra="forbid")
+
+    status: Annotated[
+        Literal["NEW", "IN_PROGRESS", "FOLLOW_UP", "WON", "LOST"],
+        Field(description="Lead status must be one of: NEW, IN_PROGRESS, FOLLOW_UP, WON, LOST")
+    ]
+    notes: NotRequired[Optional[str]]
+
+_LEAD_CREATE_ADAPTER = TypeAdapter(LeadCreate)
+_VISIT_CREATE_ADAPTER = TypeAdapter(VisitCreate)
+_LEAD_STATUS_UPDATE_ADAPTER = TypeAdapter(LeadStatusUpdate)
+
+def _json_body(adapter: TypeAdapter) -> Dict:
+    """OpenAPI request body for a handler that reads and validates the body itself."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": adapter.json_schema()}},
+        }
+    }
+
+async def _validate_body(request: Request, adapter: TypeAdapter) -> Dict:
+    """
+    Validate the raw JSON body with the given adapter.
+    Errors are raised as FastAPI's usual 422 response, with "body" locations.
+    """
+    body = await request.body()
+    try:
+        return adapter.validate_json(body)
+    except ValidationError as exc:
+        raise RequestValidationError(
+            [{**err, "loc": ("body", *err["loc"])} for err in exc.errors(include_url=False)],
+            body=body
+        )
 
 # In-memory data stores
 LEADS = {}
 VISITS = {}
 
+# Storage backends
+class InMemoryStore:
+    """Stores leads and visits in the module-level dicts (single process only)."""
+
+    async def add_lead(self, lead_id: str, lead: Dict) -> None:
+        LEADS[lead_id] = lead
+
+    async def lead_exists(self, lead_id: str) -> bool:
+        return lead_id in LEADS
+
+    async def update_lead(self, lead_id: str, fields: Dict) -> bool:
+        lead = LEADS.get(lead_id)
+        if lead is None:
+            return False
+        lead.update(fields)
+        return True
+
+    async def add_visit(self, visit_id: str, visit: Dict) -> None:
+        VISITS[visit_id] = visit
+
+    async def close(self) -> None:
+        pass
+
+# Updates a lead hash only if it still exists, in one atomic step (a separate
+# EXISTS check could race with eviction and recreate a partial hash).
+# ARGV: number of field/value pairs to set, the pairs, then fields to delete.
+_UPDATE_LEAD_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+local pairs = tonumber(ARGV[1])
+if pairs > 0 then
+    redis.call('HSET', KEYS[1], unpack(ARGV, 2, 1 + 2 * pairs))
+end
+if #ARGV > 1 + 2 * pairs then
+    redis.call('HDEL', KEYS[1], unpack(ARGV, 2 + 2 * pairs))
+end
+return 1
+"""
+
+class RedisStore:
+    """Stores leads and visits as Redis hashes (lead:<id>, visit:<id>), shared by all workers."""
+
+    def __init__(self, url: str):
+        self.redis = aioredis.from_url(url, decode_responses=True)
+        self._update_lead = self.redis.register_script(_UPDATE_LEAD_SCRIPT)
+
+    @staticmethod
+    def _mapping(data: Dict) -> Dict:
+        """Redis hashes hold strings: drop None values and serialize datetimes."""
+        return {
+            k: v.isoformat() if isinstance(v, datetime) else v
+            for k, v in data.items() if v is not None
+        }
+
+    async def add_lead(self, lead_id: str, lead: Dict) -> None:
+        await self.redis.hset(f"lead:{lead_id}", mapping=self._mapping(lead))
+
+    async def lead_exists(self, lead_id: str) -> bool:
+        return bool(await self.redis.exists(f"lead:{lead_id}"))
+
+    async def update_lead(self, lead_id: str, fields: Dict) -> bool:
+        mapping = self._mapping(fields)
+        # None fields are removed, mirroring the None stored by InMemoryStore
+        cleared = [k for k, v in fields.items() if v is None]
+        args = [len(mapping), *(x for item in mapping.items() for x in item), *cleared]
+        return bool(await self._update_lead(keys=[f"lead:{lead_id}"], args=args))
+
+    async def add_visit(self, visit_id: str, visit: Dict) -> None:
+        await self.redis.hset(f"visit:{visit_id}", mapping=self._mapping(visit))
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+store = RedisStore(REDIS_URL) if REDIS_URL else InMemoryStore()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Close the storage backend's connections on shutdown."""
+    yield
+    await store.close()
+
+# Initialize FastAPI app
+app = FastAPI(
+    title="Mock CRM Service",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
 # API Endpoints
-@app.post("/crm/leads")
-def create_lead(payload: LeadCreate):
+@app.post("/crm/leads", openapi_extra=_json_body(_LEAD_CREATE_ADAPTER))
+async def create_lead(request: Request):
     """
     Create a new lead with a unique ID.
     """
-    lead_id = str(uuid4())
-    LEADS[lead_id] = {**payload.dict(), "lead_id": lead_id, "status": "NEW"}
-    return {"lead_id": lead_id, "status": "NEW"}
+    lead = await _validate_body(request, _LEAD_CREATE_ADAPTER)
+    lead_id = uuid4().hex
+    lead["lead_id"] = lead_id
+    lead["status"] = "NEW"
+    await store.add_lead(lead_id, lead)
+    return Response(
+        content=_CREATE_LEAD_PREFIX + lead_id.encode() + _CREATE_LEAD_SUFFIX,
+        media_type="application/json"
+    )
 
-@app.post("/crm/visits")
-def create_visit(payload: VisitCreate):
+@app.post("/crm/visits", openapi_extra=_json_body(_VISIT_CREATE_ADAPTER))
+async def create_visit(request: Request):
     """
     Schedule a visit for an existing lead.
     """
-    if payload.lead_id not in LEADS:
+    visit = await _validate_body(request, _VISIT_CREATE_ADAPTER)
+    if not await store.lead_exists(visit["lead_id"]):
         raise HTTPException(status_code=404, detail="Lead not found")
 
-    visit_id = str(uuid4())
-    VISITS[visit_id] = {**payload.dict(), "visit_id": visit_id, "status": "SCHEDULED"}
-    return {"visit_id": visit_id, "status": "SCHEDULED"}
+    visit_id = uuid4().hex
+    visit["visit_id"] = visit_id
+    visit["status"] = "SCHEDULED"
+    await store.add_visit(visit_id, visit)
+    return Response(
+        content=_CREATE_VISIT_PREFIX + visit_id.encode() + _CREATE_VISIT_SUFFIX,
+        media_type="application/json"
+    )
 
-@app.post("/crm/leads/{lead_id}/status")
-def update_lead_status(lead_id: str, payload: LeadStatusUpdate):
+@app.post("/crm/leads/{lead_id}/status", openapi_extra=_json_body(_LEAD_STATUS_UPDATE_ADAPTER))
+async def update_lead_status(lead_id: str, request: Request):
     """
     Update the status of a lead.
     """
-    if lead_id not in LEADS:
+    payload = await _validate_body(request, _LEAD_STATUS_UPDATE_ADAPTER)
+    # Notes always reflect the latest update (None clears earlier notes)
+    fields = {"status": payload["status"], "notes": payload.get("notes")}
+    if not await store.update_lead(lead_id, fields):
         raise HTTPException(status_code=404, detail="Lead not found")
 
-    LEADS[lead_id]["status"] = payload.status
-    if payload.notes:
-        LEADS[lead_id]["notes"] = payload.notes
-
-    return {"lead_id": lead_id, "status": payload.status}
\ No newline at end of file
+    return {"lead_id": lead_id, "status": payload["status"]}
\ No newline at end of file